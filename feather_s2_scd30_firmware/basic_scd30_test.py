@@ -7,32 +7,29 @@ import board
 import busio
 import digitalio
 
-# Set up the built-in LED for status indication
+# Set up the built-in LED for status indication. No startup flash -
+# the first-measurement wait loop already toggles the LED, so the I2C
+# scan starts immediately instead of after 1.2 s of blinking.
 led = digitalio.DigitalInOut(board.LED)
 led.direction = digitalio.Direction.OUTPUT
 
-# Flash LED to indicate script is starting
-for _ in range(3):
-    led.value = True
-    time.sleep(0.2)
-    led.value = False
-    time.sleep(0.2)
-
 print("Starting SCD-30 sensor test...")
 
 # Initialize I2C
 i2c = busio.I2C(board.SCL, board.SDA)
 
-# Scan for I2C devices
+# Scan for I2C devices - only scan while holding the bus lock and
+# print the joined summary afterwards so the lock (and USB) aren't
+# held for one write per device
 devices = []
 print("Scanning for I2C devices...")
 
 try:
     i2c.try_lock()
-    for address in i2c.scan():
-        devices.append(address)
-        print(f"Found device at address: 0x{address:02x}")
+    devices = i2c.scan()
     i2c.unlock()
+    if devices:
+        print("I2C devices:", " ".join("0x%02x" % a for a in devices))
 except Exception as e:
     print(f"Error during I2C scan: {e}")
 
@@ -57,14 +54,18 @@ else:
         scd.start_periodic_measurement()
         
         print("Waiting for first measurement (this may take a few seconds)...")
-        # Wait for the first measurement to be available
-        timeout = 0
-        while not scd.data_available and timeout < 10:
+        # Wait for the first measurement with exponential backoff -
+        # short polls at first so a quick sample is caught within tens
+        # of milliseconds, capped at 200 ms so the average poll rate
+        # stays low
+        delay = 0.01
+        t0 = time.monotonic()
+        while not scd.data_available:
             led.value = not led.value  # Toggle LED while waiting
-            time.sleep(0.5)
-            timeout += 0.5
-            print(".", end="")
-        print()
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
+            if time.monotonic() - t0 > 10:
+                break
         
         if scd.data_available:
             # Read and display sensor data
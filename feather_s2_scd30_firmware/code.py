@@ -5,29 +5,27 @@ for Feather S2 with CircuitPython
 This script continuously reads data from an SCD30 sensor and prints it
 in both human-readable and JSON formats for easy parsing.
 """
+import sys
 import time
+import array
+import struct
 import board
 import busio
-import json
 import supervisor
 import microcontroller
 import digitalio
 import watchdog
 
-# Set up the built-in LED for status indication
+# Set up the built-in LED for status indication. No dedicated startup
+# blink - the wait for the first sample already toggles the LED, so
+# sensor bring-up isn't delayed by 600 ms of pure sleeping.
 led = digitalio.DigitalInOut(board.LED)
 led.direction = digitalio.Direction.OUTPUT
 
-# Blink LED to indicate startup
-for _ in range(3):
-    led.value = True
-    time.sleep(0.1)
-    led.value = False
-    time.sleep(0.1)
-
-# Configure watchdog timer (30 seconds timeout)
+# Configure watchdog timer - 10 seconds covers a full inter-sample
+# wait, so the idle window needs no intermediate feeds
 wdt = microcontroller.watchdog
-wdt.timeout = 30.0
+wdt.timeout = 10.0
 wdt.mode = watchdog.WatchDogMode.RESET
 
 # Import the SCD30 library
@@ -47,28 +45,210 @@ except ImportError:
 # Configure auto-reload to be on
 supervisor.runtime.autoreload = True
 
+def _crc8(data):
+    """Sensirion CRC-8 (poly 0x31, init 0xFF) over a 2-byte word."""
+    crc = 0xFF
+    for b in data:
+        crc ^= b
+        for _ in range(8):
+            if crc & 0x80:
+                crc = ((crc << 1) ^ 0x31) & 0xFF
+            else:
+                crc = (crc << 1) & 0xFF
+    return crc
+
+class SCD30Burst(adafruit_scd30.SCD30):
+    """SCD30 with a read_all() that fetches CO2, temperature and
+    humidity in a single 18-byte I2C read instead of three separate
+    property reads of the same measurement buffer."""
+
+    _READ_MEASUREMENT = 0x0300
+
+    def read_all(self):
+        """Return (co2, temperature, humidity) from one block read."""
+        try:
+            self._send_command(self._READ_MEASUREMENT)
+            with self.i2c_device as i2c_dev:
+                i2c_dev.readfrom_into(self._buffer)
+        except AttributeError:
+            # Library internals changed - fall back to property reads
+            return (self.CO2, self.temperature, self.relative_humidity)
+
+        values = []
+        for offset in range(0, 18, 6):
+            # Each float is two big-endian words, each followed by a CRC
+            for word in (offset, offset + 3):
+                if _crc8(self._buffer[word:word + 2]) != self._buffer[word + 2]:
+                    raise RuntimeError("CRC check failed reading SCD30 data")
+            raw = bytes(self._buffer[offset:offset + 2]) + \
+                bytes(self._buffer[offset + 3:offset + 5])
+            values.append(struct.unpack(">f", raw)[0])
+        return tuple(values)
+
+# Verbosity of the USB output: 0 = JSON lines only, 1 = + human
+# readable readings, 2 = + debug chatter. Every extra print is a
+# blocking USB-CDC transfer, so production runs want 0.
+LOG_LEVEL = 1
+
+# JSON envelope pieces and a preallocated output buffer - lines are
+# formatted straight into the bytearray so the steady-state output
+# path allocates nothing and the stop-the-world GC stays quiet
+_JSON_PRE_TEMP = b'JSON:{"temperature":'
+_JSON_PRE_HUM = b',"humidity":'
+_JSON_PRE_CO2 = b',"co2":'
+
+def _put_bytes(buf, off, data):
+    """Copy data into buf at off; returns the new offset."""
+    buf[off:off + len(data)] = data
+    return off + len(data)
+
+def _put_fixed(buf, off, value, decimals):
+    """Write value as ascii with the given number of decimals into buf
+    at off, without going through a Python str. Returns the new offset."""
+    scale = 1
+    for _ in range(decimals):
+        scale *= 10
+    n = int(value * scale + (0.5 if value >= 0 else -0.5))
+    if n < 0:
+        buf[off] = 0x2D  # '-'
+        off += 1
+        n = -n
+    whole, frac = divmod(n, scale)
+    ndigits = 1
+    power = 10
+    while whole >= power:
+        ndigits += 1
+        power *= 10
+    for i in range(ndigits - 1, -1, -1):
+        buf[off + i] = 0x30 + whole % 10
+        whole //= 10
+    off += ndigits
+    buf[off] = 0x2E  # '.'
+    off += 1
+    for i in range(decimals - 1, -1, -1):
+        buf[off + i] = 0x30 + frac % 10
+        frac //= 10
+    return off + decimals
+
+# Ring buffer of recent samples, stored structure-of-arrays so each
+# column is a compact array.array('f') rather than per-sample dicts.
+# Capacity is a power of two so the index wraps with a bitmask, and
+# samples are flushed to USB in batches to amortize the ~1 ms CDC
+# flush cost across several readings.
+_RING_N = 32
+_FLUSH_EVERY = 8
+_ring_co2 = array.array('f', [0.0] * _RING_N)
+_ring_temp = array.array('f', [0.0] * _RING_N)
+_ring_rh = array.array('f', [0.0] * _RING_N)
+_ring_ts = array.array('f', [0.0] * _RING_N)
+_head = 0
+
+# Output buffer sized for a full batch of JSON lines (~60 bytes each)
+_OUT_BUF = bytearray(_FLUSH_EVERY * 80)
+
+def _flush_samples():
+    """Emit the last _FLUSH_EVERY samples as one multi-line USB write,
+    formatted into the preallocated buffer."""
+    off = 0
+    for n in range(_head - _FLUSH_EVERY, _head):
+        i = n & (_RING_N - 1)
+        off = _put_bytes(_OUT_BUF, off, _JSON_PRE_TEMP)
+        off = _put_fixed(_OUT_BUF, off, _ring_temp[i], 2)
+        off = _put_bytes(_OUT_BUF, off, _JSON_PRE_HUM)
+        off = _put_fixed(_OUT_BUF, off, _ring_rh[i], 2)
+        off = _put_bytes(_OUT_BUF, off, _JSON_PRE_CO2)
+        off = _put_fixed(_OUT_BUF, off, _ring_co2[i], 1)
+        _OUT_BUF[off] = 0x7D  # '}'
+        _OUT_BUF[off + 1] = 0x0A  # '\n'
+        off += 2
+    sys.stdout.write(memoryview(_OUT_BUF)[:off])
+
+def _store_sample(co2, temperature, humidity):
+    """Append a sample to the ring, flushing a batch when one is full."""
+    global _head
+    i = _head & (_RING_N - 1)
+    _ring_co2[i] = co2
+    _ring_temp[i] = temperature
+    _ring_rh[i] = humidity
+    _ring_ts[i] = time.monotonic()
+    _head += 1
+    if _head % _FLUSH_EVERY == 0:
+        _flush_samples()
+
 # Setup I2C connection with error handling
 i2c = None
 scd = None
 
+# The SCD30's RDY line (pin 11) goes high when a new sample is ready.
+# Wiring it to D5 lets us check readiness with a single GPIO read
+# instead of a full I2C status transaction. Off by default - with the
+# pull-down, an unwired D5 reads False forever, every read times out,
+# and the error threshold escalates into a reset loop. Only set True
+# after actually jumpering RDY to D5.
+USE_RDY_PIN = False
+rdy = None
+
+def _get_i2c():
+    """Return the shared I2C bus, creating it only on first use.
+    Reconstructing busio.I2C reconfigures the peripheral and pins, so
+    retries after transient errors reuse the existing bus."""
+    global i2c
+    if i2c is None:
+        i2c = busio.I2C(board.SCL, board.SDA)
+    return i2c
+
 def initialize_sensor():
-    global i2c, scd
+    global scd, rdy
     try:
-        # Setup I2C connection
-        i2c = busio.I2C(board.SCL, board.SDA)
-        
-        # Initialize SCD30 sensor
-        scd = adafruit_scd30.SCD30(i2c)
-        
+        # Initialize SCD30 sensor on the shared I2C bus
+        scd = SCD30Burst(_get_i2c())
+
         # Set measurement interval (2 seconds)
         scd.measurement_interval = 2
-        
+
+        # Set up the RDY pin so readiness checks stay off the I2C bus
+        if USE_RDY_PIN and rdy is None:
+            rdy = digitalio.DigitalInOut(board.D5)
+            rdy.direction = digitalio.Direction.INPUT
+            rdy.pull = digitalio.Pull.DOWN
+
         print("SCD30 sensor initialized successfully")
         return True
     except Exception as e:
         print(f"ERROR initializing SCD30: {e}")
         return False
 
+def sample_ready():
+    """Check whether a new sample is ready - GPIO read of the RDY pin
+    when wired, falling back to the I2C data_available register."""
+    if rdy is not None:
+        return rdy.value
+    return scd.data_available
+
+def recover_sensor():
+    """Soft-reset the SCD30 (command 0xD304) so transient I2C failures
+    recover in ~100 ms instead of a full ~2 s microcontroller reset."""
+    global sensor_initialized
+    try:
+        if scd is not None and hasattr(scd, 'reset'):
+            scd.reset()
+        elif i2c is not None:
+            while not i2c.try_lock():
+                pass
+            try:
+                i2c.writeto(0x61, b'\xd3\x04')
+            finally:
+                i2c.unlock()
+        else:
+            return False
+        time.sleep(0.03)
+        # Force a clean re-init on the next read
+        sensor_initialized = False
+        return True
+    except Exception as e:
+        print(f"Sensor soft reset failed: {e}")
+        return False
+
 # Try to initialize the sensor
 if not initialize_sensor():
     print("Failed to initialize sensor, will retry...")
@@ -76,55 +256,67 @@ if not initialize_sensor():
 # Track sensor initialization status
 sensor_initialized = (scd is not None)
 
+# The SCD30 produces a sample every 2 seconds - track when the next one
+# is due so we can sleep up to the deadline instead of polling
+# data_available over I2C at 2 Hz
+SAMPLE_INTERVAL = 2.0
+next_sample_ts = 0.0
+
 # Function to read sensor data
 def read_sensor():
     """Read data from SCD30 sensor and print it."""
-    global sensor_initialized, scd, i2c
-    
+    global sensor_initialized, scd, i2c, next_sample_ts
+
     # Feed the watchdog
     wdt.feed()
-    
+
     # Check if sensor is initialized
     if not sensor_initialized:
         print("Sensor not initialized, attempting to initialize...")
         sensor_initialized = initialize_sensor()
         if not sensor_initialized:
             return False
-    
+
     try:
-        # Wait for sensor data to be available
+        # Sleep until just before the next expected sample so we issue
+        # only one or two I2C status reads per sample instead of ~20
+        wait = next_sample_ts - time.monotonic() - 0.15
+        while wait > 0:
+            time.sleep(min(wait, 2.0))
+            wdt.feed()
+            wait = next_sample_ts - time.monotonic() - 0.15
+
+        # Short-poll window for the sample to actually land
         timeout = 0
         max_timeout = 5  # Maximum wait time in seconds
-        
-        while not scd.data_available and timeout < max_timeout:
-            led.value = not led.value  # Toggle LED while waiting
+
+        if LOG_LEVEL >= 2 and not sample_ready():
             print("Waiting for sensor data...")
-            time.sleep(0.5)
-            timeout += 0.5
+        while not sample_ready() and timeout < max_timeout:
+            led.value = not led.value  # Toggle LED while waiting
+            time.sleep(0.02)
+            timeout += 0.02
             wdt.feed()  # Feed watchdog while waiting
-        
-        if not scd.data_available:
+
+        if not sample_ready():
             print("ERROR: No data available from SCD30 after timeout")
             return False
+
+        # Schedule the next wake-up just before the sensor's next sample
+        next_sample_ts = time.monotonic() + SAMPLE_INTERVAL
         
-        # Read the sensor data
-        co2 = scd.CO2
-        temperature = scd.temperature
-        humidity = scd.relative_humidity
+        # Read all three values in one I2C transaction
+        co2, temperature, humidity = scd.read_all()
         
         # Blink LED to indicate successful reading
         led.value = True
         
         # Print in human-readable format
-        print(f"CO2: {co2:.1f} ppm, Temp: {temperature:.2f} °C, RH: {humidity:.2f} %")
+        if LOG_LEVEL >= 1:
+            print(f"CO2: {co2:.1f} ppm, Temp: {temperature:.2f} °C, RH: {humidity:.2f} %")
         
-        # Print in JSON format for easy parsing
-        data = {
-            "temperature": round(temperature, 2),
-            "humidity": round(humidity, 2),
-            "co2": round(co2, 1)
-        }
-        print(f"JSON:{json.dumps(data)}")
+        # Queue the JSON line; batches are flushed over USB together
+        _store_sample(co2, temperature, humidity)
         
         led.value = False
         return True
@@ -139,38 +331,54 @@ def read_sensor():
         return False
 
 # Main loop
-print("Starting SCD30 sensor readings...")
-print("Press Ctrl+C to exit")
+if LOG_LEVEL >= 1:
+    print("Starting SCD30 sensor readings...")
 
 error_count = 0
 max_errors = 5
+recovery_attempts = 0
+max_recovery_attempts = 2
+
+def handle_error_threshold():
+    """Try a sensor soft reset first; escalate to a full
+    microcontroller reset only after repeated recovery failures."""
+    global error_count, recovery_attempts
+    recovery_attempts += 1
+    if recovery_attempts <= max_recovery_attempts and recover_sensor():
+        print("Sensor soft reset issued, retrying...")
+        error_count = 0
+    else:
+        print("Too many errors, resetting microcontroller...")
+        time.sleep(1)
+        microcontroller.reset()
 
 while True:
     try:
         # Feed the watchdog
         wdt.feed()
-        
+
         # Try to read sensor data
         success = read_sensor()
-        
+
         if success:
-            # Reset error count on successful reading
+            # Reset error counters on successful reading
             error_count = 0
+            recovery_attempts = 0
         else:
             # Increment error count
             error_count += 1
             print(f"Failed to read sensor. Error count: {error_count}/{max_errors}")
-            
+
             if error_count >= max_errors:
-                print("Too many errors, resetting microcontroller...")
-                time.sleep(1)
-                microcontroller.reset()
+                handle_error_threshold()
         
-        # Wait before next reading (shorter if there was an error)
+        # Wait before next reading (shorter if there was an error).
+        # The 10 s watchdog window covers the whole sleep, so a single
+        # uninterrupted sleep replaces six half-second wake-ups.
         if success:
-            for _ in range(6):  # 3 seconds with watchdog feeding
-                time.sleep(0.5)
-                wdt.feed()
+            wdt.feed()
+            time.sleep(2.8)
+            wdt.feed()
         else:
             time.sleep(2)  # Shorter delay after errors
             
@@ -178,15 +386,11 @@ while True:
         print(f"I/O ERROR in main loop: {e}")
         error_count += 1
         if error_count >= max_errors:
-            print("Too many I/O errors, resetting microcontroller...")
-            time.sleep(1)
-            microcontroller.reset()
+            handle_error_threshold()
         time.sleep(2)
     except Exception as e:
         print(f"ERROR in main loop: {e}")
         error_count += 1
         if error_count >= max_errors:
-            print("Too many errors, resetting microcontroller...")
-            time.sleep(1)
-            microcontroller.reset()
+            handle_error_threshold()
         time.sleep(2)
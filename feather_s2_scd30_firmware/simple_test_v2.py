@@ -7,20 +7,24 @@ import time
 import board
 import busio
 
+# Gate verbose diagnostics - the dir(scd) dump alone allocates a list
+# of ~60 strings on every boot, fragmenting the ESP32-S2 heap
+DEBUG = False
+
 print("Starting simple SCD-30 test...")
 
 # Initialize I2C
 i2c = busio.I2C(board.SCL, board.SDA)
 
-# Scan for I2C devices
+# Scan for I2C devices - scan inside the bus lock, print outside it
 print("Scanning for I2C devices...")
 devices = []
 try:
     i2c.try_lock()
-    for address in i2c.scan():
-        devices.append(address)
-        print(f"Found device at address: 0x{address:02x}")
+    devices = i2c.scan()
     i2c.unlock()
+    if devices:
+        print("I2C devices:", " ".join("0x%02x" % a for a in devices))
 except Exception as e:
     print(f"Error during I2C scan: {e}")
 
@@ -39,23 +43,20 @@ else:
             scd = adafruit_scd30.SCD30(i2c)
             
             # Configure the sensor - check which methods are available
-            print("SCD-30 library version info:")
-            print("Available methods:", dir(scd))
-            
+            if DEBUG:
+                print("SCD-30 library version info:")
+                print("Available methods:", dir(scd))
+
             # Set measurement interval if available
             if hasattr(scd, 'measurement_interval'):
                 scd.measurement_interval = 2
-                print("Set measurement interval to 2 seconds")
-            
+
             # Start measurements - handle different library versions
             if hasattr(scd, 'start_periodic_measurement'):
                 scd.start_periodic_measurement()
-                print("Started periodic measurement")
             elif hasattr(scd, 'start_continuous_measurement'):
                 scd.start_continuous_measurement()
-                print("Started continuous measurement")
-            else:
-                print("No start measurement method found - sensor may start automatically")
+            print("SCD-30 configured, measurements started")
             
             print("Waiting for first measurement (this may take a few seconds)...")
             # Wait for the first measurement to be available
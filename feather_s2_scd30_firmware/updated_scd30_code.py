@@ -3,7 +3,9 @@ Updated SCD-30 CO2 sensor code for Feather S2
 This code reads CO2, temperature, and humidity data from SCD-30 sensor and responds to 'read' commands with JSON data
 Compatible with the specific SCD-30 library version on your board
 """
+import sys
 import time
+import array
 import board
 import busio
 import json
@@ -11,46 +13,146 @@ import digitalio
 import supervisor
 import adafruit_scd30
 
-# Set up the built-in LED
+# Pre-bound command constants - dispatch is a substring check against
+# the accumulated buffer, with no per-iteration strip() allocation
+_CMD_READ = "read"
+_CMD_STATUS = "status"
+
+# Canned responses - these never change at runtime, so bake the JSON
+# once instead of building a dict and running json.dumps per command
+_STATUS_OK = '{"status": "running", "sensor_ready": true}'
+_STATUS_NO_SENSOR = '{"status": "running", "sensor_ready": false}'
+_ERR_SENSOR_UNAVAIL = '{"error": "Sensor not available"}'
+
+# Reading template - read_sensor() hands back plain scalars and the
+# main loop formats them straight into this. Errors go through
+# json.dumps instead: the message is arbitrary text, and %-pasting it
+# between quotes breaks the JSON as soon as it contains a '"' or '\\'.
+_JSON_TPL = '{"co2": %.1f, "temperature": %.2f, "humidity": %.2f}'
+
+# Set up the built-in LED. The dedicated startup flash is gone - the
+# LED lights as soon as the sensor initializes, which doubles as the
+# "code.py is running" indication without delaying sensor bring-up.
 led = digitalio.DigitalInOut(board.LED)
 led.direction = digitalio.Direction.OUTPUT
 
-# Flash LED to indicate code.py is starting
-for _ in range(2):
-    led.value = True
-    time.sleep(0.2)
-    led.value = False
-    time.sleep(0.2)
-
 # Initialize I2C
 i2c = None
 sensor = None
 
+# The SCD-30's RDY line (pin 11) goes high when a new sample is ready.
+# Wiring it to D5 turns the readiness check into a single GPIO read
+# instead of an I2C transaction. Off by default: on a board where RDY
+# is not actually jumpered to D5, the pull-down reads False forever
+# and every read times out. Set True only once the wire is in place.
+USE_RDY_PIN = False
+_rdy = None
+
+# Cached sensor accessors - resolved once in setup_sensor() so the hot
+# read path is a direct call instead of hasattr/getattr on every loop
+_data_ready = None
+_read_co2 = None
+_read_temp = None
+_read_rh = None
+
+# The SCD-30 produces a sample every 2 seconds - remember when the next
+# one is due so we can sleep toward the deadline instead of polling the
+# sensor over I2C at 10 Hz
+_SAMPLE_INTERVAL = 2.0
+_next_sample_ts = 0.0
+
+# Small power-of-two ring of recent samples. A 'read' command arriving
+# within a second of a capture is served from here - a buffer fetch -
+# instead of a fresh I2C read and CRC pass on the sensor.
+_RING_CAP = 8
+_RING_MASK = _RING_CAP - 1
+_ring_co2 = array.array('f', [0.0] * _RING_CAP)
+_ring_temp = array.array('f', [0.0] * _RING_CAP)
+_ring_rh = array.array('f', [0.0] * _RING_CAP)
+_ring_ts = array.array('f', [0.0] * _RING_CAP)
+_ring_head = 0
+_CACHE_MAX_AGE = 1.0
+
+def _cached_sample():
+    """Return the newest ring entry as an (ok, co2, temperature,
+    humidity) tuple if it is still fresh, else None."""
+    if _ring_head == 0:
+        return None
+    i = (_ring_head - 1) & _RING_MASK
+    if time.monotonic() - _ring_ts[i] > _CACHE_MAX_AGE:
+        return None
+    return (True, _ring_co2[i], _ring_temp[i], _ring_rh[i])
+
+def _bind_sensor_accessors():
+    """Resolve the library's attribute names once and cache bound accessors"""
+    global _data_ready, _read_co2, _read_temp, _read_rh
+
+    if _rdy is not None:
+        # GPIO read of the RDY pin - keeps readiness checks off the bus
+        _data_ready = lambda p=_rdy: p.value
+    elif hasattr(sensor, 'data_available'):
+        _data_ready = lambda s=sensor: s.data_available
+    else:
+        _data_ready = lambda s=sensor: s.data_ready
+
+    if hasattr(sensor, 'CO2'):
+        _read_co2 = lambda s=sensor: s.CO2
+    elif hasattr(sensor, 'co2'):
+        _read_co2 = lambda s=sensor: s.co2
+    else:
+        _read_co2 = lambda: 0
+
+    if hasattr(sensor, 'temperature'):
+        _read_temp = lambda s=sensor: s.temperature
+    else:
+        _read_temp = lambda: 0
+
+    if hasattr(sensor, 'relative_humidity'):
+        _read_rh = lambda s=sensor: s.relative_humidity
+    elif hasattr(sensor, 'humidity'):
+        _read_rh = lambda s=sensor: s.humidity
+    else:
+        _read_rh = lambda: 0
+
+def _get_i2c():
+    """Return the shared I2C bus, creating it only on first use so
+    setup retries don't reconfigure the peripheral each time."""
+    global i2c
+    if i2c is None:
+        i2c = busio.I2C(board.SCL, board.SDA)
+    return i2c
+
 def setup_sensor():
     """Initialize the SCD-30 sensor"""
-    global i2c, sensor
+    global sensor, _rdy
     try:
-        # Initialize I2C
-        i2c = busio.I2C(board.SCL, board.SDA)
-        
         # Initialize SCD-30 sensor - default I2C address is 0x61
-        sensor = adafruit_scd30.SCD30(i2c)
-        
+        sensor = adafruit_scd30.SCD30(_get_i2c())
+
         # Configure sensor - check which methods are available
         if hasattr(sensor, 'measurement_interval'):
             sensor.measurement_interval = 2
-        
+
         # Start measurements - handle different library versions
         if hasattr(sensor, 'start_periodic_measurement'):
             sensor.start_periodic_measurement()
         elif hasattr(sensor, 'start_continuous_measurement'):
             sensor.start_continuous_measurement()
-        
-        # Indicate success with LED
+
+        # Set up the RDY pin so readiness checks stay off the I2C bus
+        if USE_RDY_PIN and _rdy is None:
+            _rdy = digitalio.DigitalInOut(board.D5)
+            _rdy.direction = digitalio.Direction.INPUT
+            _rdy.pull = digitalio.Pull.DOWN
+
+        # Resolve attribute names once so read_sensor() doesn't pay for
+        # hasattr/getattr on every reading
+        _bind_sensor_accessors()
+
+        # Indicate success with the LED; the main loop clears it at the
+        # top of each iteration, so no blocking sleep is needed here
         led.value = True
-        time.sleep(0.5)
-        led.value = False
-        
+
         return True
     except Exception as e:
         # Indicate error with rapid LED flashing
@@ -63,58 +165,60 @@ def setup_sensor():
         return False
 
 def read_sensor():
-    """Read data from SCD-30 sensor and return as dictionary"""
+    """Read data from SCD-30 sensor.
+
+    Returns an (ok, co2, temperature, humidity) tuple on success, or
+    (False, error_message, 0, 0) on failure - scalar returns avoid a
+    dict allocation and key lookup on the hot path."""
+    global _next_sample_ts, _ring_head
     try:
         if not sensor:
-            return {"error": "Sensor not initialized"}
-        
-        # Check which attribute to use for data availability
-        data_available_attr = 'data_available' if hasattr(sensor, 'data_available') else 'data_ready'
-        
+            return (False, "Sensor not initialized", 0, 0)
+
+        # Serve from the recent-sample ring if a fresh capture exists
+        cached = _cached_sample()
+        if cached is not None:
+            return cached
+
         # Wait for data to be available
-        if not getattr(sensor, data_available_attr):
-            # Wait up to 2 seconds for data
+        if not _data_ready():
+            # Sleep toward the sensor's known 2 s cadence first, then
+            # short-poll for the sample to land
+            wait = _next_sample_ts - time.monotonic() - 0.15
+            if wait > 0:
+                time.sleep(wait)
+
             timeout = 0
-            while not getattr(sensor, data_available_attr) and timeout < 2:
-                time.sleep(0.1)
-                timeout += 0.1
-                
-            if not getattr(sensor, data_available_attr):
-                return {"error": "No data available from sensor"}
-        
-        # Read sensor data - check which attributes are available
-        if hasattr(sensor, 'CO2'):
-            co2 = sensor.CO2
-        elif hasattr(sensor, 'co2'):
-            co2 = sensor.co2
-        else:
-            co2 = 0
-            
-        if hasattr(sensor, 'temperature'):
-            temperature = sensor.temperature
-        else:
-            temperature = 0
-            
-        if hasattr(sensor, 'relative_humidity'):
-            humidity = sensor.relative_humidity
-        elif hasattr(sensor, 'humidity'):
-            humidity = sensor.humidity
-        else:
-            humidity = 0
+            while not _data_ready() and timeout < 2:
+                time.sleep(0.02)
+                timeout += 0.02
+
+            if not _data_ready():
+                return (False, "No data available from sensor", 0, 0)
+
+        _next_sample_ts = time.monotonic() + _SAMPLE_INTERVAL
+
+        # Read sensor data through the cached accessors
+        co2 = _read_co2()
+        temperature = _read_temp()
+        humidity = _read_rh()
+
+        # Record the capture in the ring for near-term 'read' commands
+        i = _ring_head & _RING_MASK
+        _ring_co2[i] = co2
+        _ring_temp[i] = temperature
+        _ring_rh[i] = humidity
+        _ring_ts[i] = time.monotonic()
+        _ring_head += 1
         
-        # Blink LED to indicate successful reading
+        # Light the LED to indicate a successful reading; it is turned
+        # off at the start of the next loop iteration so the indication
+        # costs no blocking sleep here
         led.value = True
-        time.sleep(0.1)
-        led.value = False
-        
-        # Return data as dictionary
-        return {
-            "co2": round(co2, 1),
-            "temperature": round(temperature, 2),
-            "humidity": round(humidity, 2)
-        }
+
+        return (True, co2, temperature, humidity)
     except Exception as e:
-        return {"error": str(e)}
+        return (False, str(e), 0, 0)
 
 # Initialize sensor
 sensor_ready = setup_sensor()
@@ -122,31 +226,47 @@ if not sensor_ready:
     print("Failed to initialize sensor. Check connections and try again.")
 
 # Main loop
+# Bind hot globals as locals first - LOAD_FAST is much cheaper than
+# LOAD_GLOBAL + LOAD_ATTR on every iteration of a tight loop
+_sleep = time.sleep
+_stdin_read = sys.stdin.read
+_runtime = supervisor.runtime
+_print = print
+_dumps = json.dumps
+
+cmd_buf = ""
 while True:
     try:
-        # Check for incoming serial data
-        if supervisor.runtime.serial_bytes_available:
-            command = input().strip()
-            
-            # Process commands
-            if command == "read":
-                if sensor_ready:
-                    data = read_sensor()
-                    print(json.dumps(data))
-                else:
+        # Clear the success indicator from the previous reading
+        led.value = False
+
+        # Drain any incoming serial data without blocking - input()
+        # would stall the loop until a full line arrives
+        n = _runtime.serial_bytes_available
+        if n:
+            cmd_buf += _stdin_read(n)
+
+        # Dispatch once a complete command line has arrived
+        if "\n" in cmd_buf:
+            if _CMD_READ in cmd_buf:
+                if not sensor_ready:
                     # Try to initialize sensor again
                     sensor_ready = setup_sensor()
-                    if sensor_ready:
-                        data = read_sensor()
-                        print(json.dumps(data))
+                if sensor_ready:
+                    ok, co2, temp, rh = read_sensor()
+                    if ok:
+                        _print(_JSON_TPL % (co2, temp, rh))
                     else:
-                        print(json.dumps({"error": "Sensor not available"}))
-            elif command == "status":
-                print(json.dumps({"status": "running", "sensor_ready": sensor_ready}))
-        
+                        _print(_dumps({"error": co2}))
+                else:
+                    _print(_ERR_SENSOR_UNAVAIL)
+            elif _CMD_STATUS in cmd_buf:
+                _print(_STATUS_OK if sensor_ready else _STATUS_NO_SENSOR)
+            cmd_buf = ""
+
         # Short delay to prevent tight loop
-        time.sleep(0.1)
-        
+        _sleep(0.1)
+
     except Exception as e:
-        print(json.dumps({"error": f"Exception in main loop: {str(e)}"}))
-        time.sleep(1)  # Delay to prevent rapid error messages
+        _print(_dumps({"error": f"Exception in main loop: {str(e)}"}))
+        _sleep(1)  # Delay to prevent rapid error messages
@@ -7,15 +7,22 @@ connected to a Feather S2 board via I2C, and stores the data in InfluxDB Cloud.
 """
 
 import os
+import re
 import time
+import random
 import logging
+import queue
+import selectors
+import threading
 import serial
 import json
 import sys
 import requests
-from datetime import datetime
+import urllib3
+from collections import namedtuple
+from dataclasses import dataclass
 from dotenv import load_dotenv
-from influxdb_client import InfluxDBClient, Point
+from influxdb_client import InfluxDBClient
 from influxdb_client.client.write_api import SYNCHRONOUS
 from influxdb_client.rest import ApiException
 
@@ -30,6 +37,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Patterns used on every measurement cycle, compiled once at import
+# instead of re-parsed inside read_sensor_data. Bytes patterns - the
+# wire protocol is ASCII-only, so lines are matched raw and nothing
+# is UTF-8 decoded on the parse path.
+_JSON_PREFIX_RE = re.compile(rb'JSON:(\{.*?\})', re.DOTALL)
+_JSON_RE = re.compile(rb'\{.*?\}', re.DOTALL)
+
+# Line-protocol templates, bound to .format once - writing the string
+# directly skips Point's dict inserts, datetime allocation and
+# to_line_protocol() reflection on every sample
+_SCD30_LP_FMT = "scd30_sensor,device=feather_s2 co2={},temperature={},humidity={} {}".format
+_BME688_LP_FMT = ("bme688_sensor,device=feather_s2 temperature={},humidity={},"
+                  "pressure={},gas_resistance={},voc={} {}").format
+
+# Field sets for dispatching on sensor type - one subset test instead
+# of chained data.get() truthiness checks, which also mishandled
+# legitimate 0.0 readings
+_BME688_KEYS = frozenset({"temperature", "humidity", "pressure", "gas_resistance", "voc"})
+_SCD30_KEYS = frozenset({"co2", "temperature", "humidity"})
+
+# Per-sensor write specs: required keys, line-protocol template, and
+# the field order the template expects. Adding a sensor type is one
+# spec line instead of another if/elif branch in write_data.
+SensorSpec = namedtuple("SensorSpec", "keys fmt fields")
+_SENSOR_SPECS = (
+    SensorSpec(_SCD30_KEYS, _SCD30_LP_FMT, ("co2", "temperature", "humidity")),
+    SensorSpec(_BME688_KEYS, _BME688_LP_FMT,
+               ("temperature", "humidity", "pressure", "gas_resistance", "voc")),
+)
+
+# Sentinel telling the writer thread to flush and exit
+_STOP = object()
+
 # Helper function to safely get and convert environment variables
 def get_env_var(var_name, default=None, var_type=str):
     value = os.getenv(var_name, default)
@@ -55,30 +95,81 @@ def get_env_var(var_name, default=None, var_type=str):
         logger.error(f"Error converting {var_name}: {e}")
         return default
 
-# Global variables for configuration
-INFLUXDB_URL = None
-INFLUXDB_TOKEN = None
-INFLUXDB_ORG = None
-INFLUXDB_BUCKET = None
-COM_PORT = None
-MEASUREMENT_INTERVAL = 60
-SENSOR_TYPE = "scd30"
+@dataclass(frozen=True)
+class Config:
+    """Parsed environment configuration, computed once per load."""
+    url: str
+    token: str
+    org: str
+    bucket: str
+    com_port: str
+    interval: int
+    sensor_type: str
+    is_cloud: bool
 
 def load_configuration():
-    """Load configuration from environment variables"""
-    global INFLUXDB_URL, INFLUXDB_TOKEN, INFLUXDB_ORG, INFLUXDB_BUCKET, COM_PORT, MEASUREMENT_INTERVAL, SENSOR_TYPE
-    
+    """Load configuration from environment variables into a Config"""
     # Load environment variables - force reload
     load_dotenv(override=True)
     
-    # Get InfluxDB configuration
-    INFLUXDB_URL = get_env_var("INFLUXDB_URL")
-    INFLUXDB_TOKEN = get_env_var("INFLUXDB_TOKEN")
-    INFLUXDB_ORG = get_env_var("INFLUXDB_ORG")
-    INFLUXDB_BUCKET = get_env_var("INFLUXDB_BUCKET")
-    COM_PORT = get_env_var("COM_PORT")
-    MEASUREMENT_INTERVAL = get_env_var("MEASUREMENT_INTERVAL", 60, int)
-    SENSOR_TYPE = get_env_var("SENSOR_TYPE", "scd30")  # Default to SCD30
+    url = get_env_var("INFLUXDB_URL")
+    return Config(
+        url=url,
+        token=get_env_var("INFLUXDB_TOKEN"),
+        org=get_env_var("INFLUXDB_ORG"),
+        bucket=get_env_var("INFLUXDB_BUCKET"),
+        com_port=get_env_var("COM_PORT"),
+        interval=get_env_var("MEASUREMENT_INTERVAL", 60, int),
+        sensor_type=get_env_var("SENSOR_TYPE", "scd30"),  # Default to SCD30
+        # Decided once here instead of re-scanning the URL elsewhere
+        is_cloud=bool(url) and ('cloud' in url.lower() or not url.startswith('http://localhost')),
+    )
+
+class BufferedSerial:
+    """Buffered reader over a serial.Serial connection.
+
+    Collapses the many small in_waiting/read() calls into chunked reads
+    of up to 2 KB (the pyserial issue #216 ReadLine recipe), accumulating
+    bytes in a bytearray until a full line or an idle gap."""
+
+    CHUNK = 2048
+
+    def __init__(self, serial_conn):
+        self.s = serial_conn
+        self.buf = bytearray()
+        # Wait for readability via the OS instead of timing out short
+        # reads. Windows COM handles expose no selectable fd, so fall
+        # back to timeout-bounded reads there.
+        self.sel = None
+        try:
+            sel = selectors.DefaultSelector()
+            sel.register(serial_conn.fileno(), selectors.EVENT_READ)
+            self.sel = sel
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def _wait_readable(self, timeout):
+        """Block until the port has data or the timeout lapses."""
+        if self.sel is not None:
+            self.sel.select(timeout=timeout)
+
+    def readline(self, timeout=10):
+        """Return one newline-terminated line as bytes, or b'' if none
+        arrives before the timeout."""
+        deadline = time.monotonic() + timeout
+        while True:
+            nl = self.buf.find(b'\n')
+            if nl >= 0:
+                line = bytes(self.buf[:nl + 1])
+                del self.buf[:nl + 1]
+                return line
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return b''
+            self._wait_readable(remaining)
+            chunk = self.s.read(max(1, min(self.CHUNK, self.s.in_waiting)))
+            if chunk:
+                self.buf.extend(chunk)
 
 class FeatherS2SensorReader:
     """Class to handle communication with the Feather S2 board and BME688 sensor."""
@@ -88,335 +179,138 @@ class FeatherS2SensorReader:
         self.com_port = com_port
         self.baud_rate = baud_rate
         self.serial_conn = None
+        self.buffered = None
         self.sensor_type = sensor_type  # "bme688" or "scd30"
-        
+        # Cheap connection-state flag - read_sensor_data checks this
+        # instead of querying the port's is_open property every cycle
+        self._connected = False
+
     def connect(self):
         """Establish a serial connection to the Feather S2 board."""
         try:
-            self.serial_conn = serial.Serial(self.com_port, self.baud_rate, timeout=2)
+            # Short read timeout plus inter-byte timeout: read() returns
+            # as soon as the device pauses rather than blocking for a
+            # fixed 2 s, so readline deadlines are honored within ~50 ms
+            self.serial_conn = serial.Serial(self.com_port, self.baud_rate,
+                                             timeout=0.05,
+                                             inter_byte_timeout=0.02,
+                                             write_timeout=1.0)
+            # Ask the UART driver to deliver bytes as they arrive
+            # (ASYNC_LOW_LATENCY); no-op where unsupported
+            try:
+                self.serial_conn.set_low_latency_mode(True)
+            except (AttributeError, NotImplementedError, ValueError, OSError):
+                pass
+            self.buffered = BufferedSerial(self.serial_conn)
             logger.info(f"Connected to {self.com_port} at {self.baud_rate} baud")
             
             # Allow time for the serial connection to initialize
             time.sleep(2)
             
-            # Clear any initial data in the buffer
-            # self.serial_conn.reset_input_buffer()
-            
-            # # Exit the CircuitPython REPL if active by sending Ctrl+C
-            # self.serial_conn.write(b'\x03\x03')  # Send Ctrl+C twice
-            # time.sleep(0.5)
-            
-            # # Clear buffer again after Ctrl+C
-            # if self.serial_conn.in_waiting:
-            #     initial_data = self.serial_conn.read(self.serial_conn.in_waiting).decode('utf-8', errors='replace')
-            #     logger.info(f"Cleared initial data: '{initial_data}'")
-            
-            # # Send a newline to check if we get a response
-            # self.serial_conn.write(b'\n')
-            # time.sleep(0.5)
+            # Discard boot chatter so the first readline starts at a
+            # clean line boundary
+            self.serial_conn.reset_input_buffer()
             
+            self._connected = True
             return True
         except serial.SerialException as e:
             logger.error(f"Failed to connect to {self.com_port}: {e}")
+            self._connected = False
             return False
     
     def disconnect(self):
         """Close the serial connection."""
+        self._connected = False
         if self.serial_conn and self.serial_conn.is_open:
             self.serial_conn.close()
             logger.info(f"Disconnected from {self.com_port}")
     
     def read_sensor_data(self):
-        """Read sensor data from the Feather S2 board."""
-        if not self.serial_conn or not self.serial_conn.is_open:
+        """Read one JSON-prefixed sensor line from the Feather S2.
+
+        The device's code.py prints a `JSON:{...}` line on its own
+        schedule, so the host just reads lines until one shows up -
+        no REPL round-trips, no fixed sleeps."""
+        if not self._connected:
             logger.error("Serial connection is not open")
             return None
-        
+
         try:
-            # Check if there's any data available
-            timeout_counter = 0
-            max_timeout = 10  # Maximum wait time in seconds
-            
-            # Wait for data to be available with timeout
-            while self.serial_conn.in_waiting == 0 and timeout_counter < max_timeout:
-                time.sleep(0.5)
-                timeout_counter += 0.5
-                
-            if self.serial_conn.in_waiting == 0:
-                logger.warning("No data received from sensor within timeout period")
-                return None
-            
-            # Read all available data
-            all_data = ""
-            try:
-                all_data = self.serial_conn.read(self.serial_conn.in_waiting).decode('utf-8', errors='replace')
-                logger.info(f"Received data: '{all_data}'")
-            except serial.SerialException as e:
-                logger.error(f"Serial read error: {e}")
-                self.disconnect()
-                time.sleep(1)
-                self.connect()  # Try to reconnect
-                return None
-            except Exception as e:
-                logger.error(f"Error reading serial data: {e}")
-                return None
-                
-            # Check for I/O errors in the data
-            if "I/O ERROR" in all_data or "[Errno 5] Input/output error" in all_data:
-                logger.warning("I/O error detected in sensor output, waiting for device to recover")
-                time.sleep(2)  # Give the device time to reset or recover
-                return None
-                
-            # Look for JSON data in the response with JSON: prefix
-            import re
-            # First try to match the JSON: prefix format
-            json_match = re.search(r'JSON:(\{.*?\})', all_data, re.DOTALL)
-            
-            # If that doesn't work, fall back to the generic JSON pattern
-            if not json_match:
-                logger.info("Falling back to generic JSON pattern search")
-                json_match = re.search(r'\{.*?\}', all_data, re.DOTALL)
-                
-            if json_match:
-                # If we matched the JSON: prefix pattern, use group(1) to get just the JSON part
-                # If we matched the generic pattern, use group(0) to get the whole match
-                if 'JSON:' in all_data and json_match.re.pattern.startswith('JSON:'):
+            deadline = time.monotonic() + 10  # max wait per cycle
+            while time.monotonic() < deadline:
+                line = self.buffered.readline(timeout=2)
+                if not line:
+                    continue
+
+                # Check for I/O errors in the output
+                if b"I/O ERROR" in line or b"[Errno 5] Input/output error" in line:
+                    logger.warning("I/O error detected in sensor output, waiting for device to recover")
+                    time.sleep(2)  # Give the device time to reset or recover
+                    return None
+
+                # Prefer the JSON: prefix format; fall back to a bare
+                # JSON object for firmware that prints the dict alone.
+                # The line stays as bytes throughout - only the matched
+                # JSON fragment ever reaches the json parser.
+                json_match = _JSON_PREFIX_RE.search(line)
+                if not json_match and line.lstrip().startswith(b'{'):
+                    json_match = _JSON_RE.search(line)
+                if not json_match:
+                    continue  # boot banner / human-readable chatter
+
+                if json_match.re is _JSON_PREFIX_RE:
                     json_str = json_match.group(1)
                 else:
                     json_str = json_match.group(0)
-                logger.info(f"Found JSON string: '{json_str}'")
-                
                 try:
-                    # Parse JSON response
+                    # json.loads accepts bytes directly
                     sensor_data = json.loads(json_str)
-                    logger.info(f"Parsed sensor data: {sensor_data}")
+                    logger.info("Parsed sensor data: %s", sensor_data)
                     return sensor_data
                 except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse extracted JSON: {e}")
-            else:
-                logger.warning("No JSON data found in response")
-                
-                # If we received 'read' echoed back, we might be in the REPL
-                if 'read' in all_data:
-                    logger.warning("CircuitPython REPL detected. Trying to read sensor directly via REPL...")
-                    
-                    # Try to read sensor data directly through REPL commands
-                    self.serial_conn.reset_input_buffer()
-                    
-                    # Send individual commands with proper line endings based on sensor type
-                    # The REPL needs proper line endings to execute commands
-                    if self.sensor_type == "bme688":
-                        commands = [
-                            "import board",
-                            "import busio", 
-                            "import adafruit_bme680", 
-                            "i2c = busio.I2C(board.SCL, board.SDA)", 
-                            "bme = adafruit_bme680.Adafruit_BME680_I2C(i2c, address=0x77)",
-                            "print(f'TEMP:{bme.temperature:.2f}')",
-                            "print(f'HUM:{bme.relative_humidity:.2f}')",
-                            "print(f'PRES:{bme.pressure/100.0:.2f}')",
-                            "print(f'GAS:{bme.gas:.2f}')"
-                        ]
-                    elif self.sensor_type == "scd30":
-                        commands = [
-                            "import board",
-                            "import busio", 
-                            "import adafruit_scd30", 
-                            "i2c = busio.I2C(board.SCL, board.SDA)", 
-                            "try:",
-                            "    scd = adafruit_scd30.SCD30(i2c)",
-                            "    print('SCD30 initialized successfully')",
-                            "    # Force a measurement",
-                            "    scd.start_periodic_measurement()",
-                            "    import time",
-                            "    print('Waiting for measurement...')",
-                            "    # Wait longer for SCD30 to have data available",
-                            "    for i in range(10):",
-                            "        if scd.data_available:",
-                            "            break",
-                            "        print(f'Waiting {i+1}/10')",
-                            "        time.sleep(1)",
-                            "    if scd.data_available:",
-                            "        co2 = scd.CO2",
-                            "        temp = scd.temperature",
-                            "        hum = scd.relative_humidity",
-                            "        print(f'CO2:{co2:.1f}')",
-                            "        print(f'TEMP:{temp:.2f}')",
-                            "        print(f'HUM:{hum:.2f}')",
-                            "    else:",
-                            "        print('No data available from SCD-30 after waiting')",
-                            "except Exception as e:",
-                            "    print(f'Error initializing SCD30: {e}')"
-                        ]
-                    
-                    # Clear any existing data
-                    self.serial_conn.reset_input_buffer()
-                    
-                    # Send each command with proper line endings
-                    for cmd in commands:
-                        self.serial_conn.write(f"{cmd}\r\n".encode())
-                        time.sleep(0.5)  # Wait for command to execute
-                        
-                        # Read any response to keep the buffer clear
-                        if self.serial_conn.in_waiting:
-                            response = self.serial_conn.read(self.serial_conn.in_waiting).decode('utf-8', errors='replace')
-                            logger.debug(f"Command response: {response}")
-                    
-                    # Wait for all commands to complete
-                    time.sleep(5)  # Give it more time to execute all commands for SCD30
-                    
-                    # Read the final response
-                    response_data = ""
-                    if self.serial_conn.in_waiting:
-                        response_data = self.serial_conn.read(self.serial_conn.in_waiting).decode('utf-8', errors='replace')
-                        logger.info(f"REPL response: {response_data}")
-                        
-                        # Parse the response based on sensor type
-                        sensor_data = {}
-                        
-                        if self.sensor_type == "bme688":
-                            # Extract temperature, humidity, pressure, and gas readings
-                            temp_match = re.search(r'TEMP:([0-9.]+)', response_data)
-                            hum_match = re.search(r'HUM:([0-9.]+)', response_data)
-                            pres_match = re.search(r'PRES:([0-9.]+)', response_data)
-                            gas_match = re.search(r'GAS:([0-9.]+)', response_data)
-                            
-                            if temp_match and hum_match and pres_match and gas_match:
-                                try:
-                                    temperature = float(temp_match.group(1))
-                                    humidity = float(hum_match.group(1))
-                                    pressure = float(pres_match.group(1))
-                                    gas_resistance = float(gas_match.group(1))
-                                    
-                                    # Calculate VOC index (simplified)
-                                    # This is a very basic approximation
-                                    voc = max(1.0, min(5.0, gas_resistance / 50000.0))
-                                    
-                                    sensor_data = {
-                                        "temperature": temperature,
-                                        "humidity": humidity,
-                                        "pressure": pressure,
-                                        "gas_resistance": gas_resistance,
-                                        "voc": voc
-                                    }
-                                    logger.info(f"Parsed BME688 data: {sensor_data}")
-                                    return sensor_data
-                                except ValueError as e:
-                                    logger.error(f"Failed to convert BME688 values: {e}")
-                            else:
-                                logger.error("Could not find all BME688 readings in response")
-                                
-                        elif self.sensor_type == "scd30":
-                            # Extract CO2, temperature, and humidity readings
-                            co2_match = re.search(r'CO2:([0-9.]+)', response_data)
-                            temp_match = re.search(r'TEMP:([0-9.]+)', response_data)
-                            hum_match = re.search(r'HUM:([0-9.]+)', response_data)
-                            
-                            # Log all matches for debugging
-                            logger.info(f"CO2 match: {co2_match.group(1) if co2_match else 'None'}")
-                            logger.info(f"TEMP match: {temp_match.group(1) if temp_match else 'None'}")
-                            logger.info(f"HUM match: {hum_match.group(1) if hum_match else 'None'}")
-                            
-                            # Check for initialization messages
-                            init_success = 'SCD30 initialized successfully' in response_data
-                            waiting_msgs = re.findall(r'Waiting ([0-9]+)/10', response_data)
-                            no_data_msg = 'No data available from SCD-30' in response_data
-                            error_msg = re.search(r'Error initializing SCD30: (.*)', response_data)
-                            
-                            if error_msg:
-                                logger.error(f"SCD30 initialization error: {error_msg.group(1)}")
-                            elif no_data_msg:
-                                logger.warning("SCD30 reported no data available")
-                            elif init_success:
-                                logger.info("SCD30 initialized successfully")
-                                if waiting_msgs:
-                                    logger.info(f"Waited {len(waiting_msgs)} cycles for data")
-                            
-                            if co2_match and temp_match and hum_match:
-                                try:
-                                    co2 = float(co2_match.group(1))
-                                    temperature = float(temp_match.group(1))
-                                    humidity = float(hum_match.group(1))
-                                    
-                                    sensor_data = {
-                                        "co2": co2,
-                                        "temperature": temperature,
-                                        "humidity": humidity
-                                    }
-                                    logger.info(f"Parsed SCD30 data: {sensor_data}")
-                                    return sensor_data
-                                except ValueError as e:
-                                    logger.error(f"Failed to convert SCD30 values: {e}")
-                            else:
-                                logger.error("Could not find all SCD30 readings in response")
-                                
-                                # Try to extract any partial data
-                                if co2_match or temp_match or hum_match:
-                                    partial_data = {}
-                                    if co2_match:
-                                        try:
-                                            partial_data["co2"] = float(co2_match.group(1))
-                                        except ValueError:
-                                            pass
-                                    if temp_match:
-                                        try:
-                                            partial_data["temperature"] = float(temp_match.group(1))
-                                        except ValueError:
-                                            pass
-                                    if hum_match:
-                                        try:
-                                            partial_data["humidity"] = float(hum_match.group(1))
-                                        except ValueError:
-                                            pass
-                                    
-                                    if partial_data and len(partial_data) >= 2:  # At least 2 valid readings
-                                        logger.warning(f"Using partial SCD30 data: {partial_data}")
-                                        return partial_data
-                            
-                            # If no JSON with prefix found, try the original JSON pattern
-                            json_match = re.search(r'\{.*?\}', response_data, re.DOTALL)
-                            if json_match:
-                                try:
-                                    json_str = json_match.group(0)
-                                    logger.info(f"Found JSON string: '{json_str}'")
-                                    sensor_data = json.loads(json_str)
-                                    logger.info(f"Parsed sensor data: {sensor_data}")
-                                    return sensor_data
-                                except json.JSONDecodeError as e:
-                                    logger.error(f"Failed to parse JSON: {e}")
-                            
-            else:
-                logger.warning("No data received from sensor. Check if the Feather S2 is responding.")
-                
-                # If we got here, we didn't get valid data
-                return None
-        except serial.SerialException as e:
-            logger.error(f"Serial communication error: {e}")
+                    logger.error("Failed to parse extracted JSON: %s", e)
+                    return None
+
+            logger.warning("No JSON data received from sensor within timeout period")
+            return None
+        except (serial.SerialException, OSError) as e:
+            # pyserial raises from read()/in_waiting when the port
+            # drops - reconnect here rather than prechecking is_open
+            logger.error("Serial communication error: %s", e)
             self.disconnect()
-            # Wait a moment before returning
             time.sleep(1)
+            self.connect()  # Try to reconnect
             return None
         except Exception as e:
-            logger.error(f"Error reading sensor data: {e}")
+            logger.error("Error reading sensor data: %s", e)
             return None
-        finally:
-            # We don't want to disconnect here anymore since we're using continuous reading
-            pass
 
 class InfluxDBWriter:
     """Class to handle writing data to InfluxDB or InfluxDB Cloud."""
     
-    def __init__(self, url, token, org, bucket, max_retries=3, retry_delay=5):
-        """Initialize the InfluxDB client."""
-        self.url = url
-        self.token = token
-        self.org = org
-        self.bucket = bucket
+    def __init__(self, config, max_retries=3, retry_delay=5,
+                 batch_size=500, max_wait=10.0):
+        """Initialize the InfluxDB client from a Config."""
+        self.cfg = config
+        self.url = config.url
+        self.token = config.token
+        self.org = config.org
+        self.bucket = config.bucket
         self.client = None
         self.write_api = None
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self.is_cloud = 'cloud' in url.lower() or not url.startswith('http://localhost')
+        self.is_cloud = config.is_cloud
+        # Points are accumulated here and flushed in batches so each
+        # sample doesn't pay a full HTTPS round-trip to InfluxDB Cloud
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._pending = []
+        self._last_flush = time.monotonic()
+        # Records flow through this queue to a background writer
+        # thread, so the serial-read loop never waits on the network
+        self._q = queue.Queue(maxsize=10_000)
+        self._writer_thread = None
         
     def connect(self):
         """Connect to InfluxDB with retry logic."""
@@ -424,7 +318,20 @@ class InfluxDBWriter:
             try:
                 # Initialize the InfluxDB client
                 logger.info(f"Connecting to InfluxDB at {self.url} (Attempt {attempt}/{self.max_retries})...")
-                self.client = InfluxDBClient(url=self.url, token=self.token, org=self.org)
+                # gzip cuts the repetitive line-protocol text 3-5x on
+                # the wire, which matters on the cloud write path
+                self.client = InfluxDBClient(url=self.url, token=self.token,
+                                             org=self.org, enable_gzip=True)
+                try:
+                    pool_kw = self.client.api_client.rest_client.pool_manager.connection_pool_kw
+                    pool_kw['maxsize'] = 4
+                except AttributeError:
+                    pass  # client internals moved; defaults are fine
+                # Batching happens in this class (queue + _pending), so
+                # the write api itself is synchronous: flush() blocks on
+                # the POST and actually sees write failures, instead of
+                # handing the batch to a second batcher that reports
+                # errors to nobody
                 self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
                 
                 # Verify connection by checking health
@@ -450,6 +357,13 @@ class InfluxDBWriter:
                     return False
                 
                 logger.info(f"Successfully connected to InfluxDB at {self.url}")
+
+                # Start the background writer that drains the queue
+                if self._writer_thread is None or not self._writer_thread.is_alive():
+                    self._writer_thread = threading.Thread(
+                        target=self._drain, daemon=True, name="influxdb-writer")
+                    self._writer_thread.start()
+
                 return True
                 
             except ApiException as e:
@@ -484,74 +398,120 @@ class InfluxDBWriter:
                     return False
     
     def write_data(self, data):
-        """Write sensor data to InfluxDB with retry logic."""
+        """Queue sensor data for InfluxDB, flushing in batches."""
         if not self.client or not self.write_api:
             logger.error("InfluxDB client is not initialized")
             return False
-        
+
+        # Build the line-protocol record from the first matching spec
+        ts_ns = time.time_ns()
+        keys = data.keys()
+        record = None
+        for spec in _SENSOR_SPECS:
+            if spec.keys <= keys:
+                record = spec.fmt(*(data[f] for f in spec.fields), ts_ns)
+                break
+        if record is None:
+            logger.error("Invalid data format: %s", data)
+            return False
+
+        # Hand the record to the writer thread - the read loop returns
+        # immediately instead of riding out an HTTPS round-trip
+        try:
+            self._q.put_nowait(record)
+        except queue.Full:
+            logger.warning("Write queue full, dropping sample")
+            return False
+        return True
+
+    def _drain(self):
+        """Writer-thread loop: batch queued records and flush them."""
+        while True:
+            try:
+                item = self._q.get(timeout=self.max_wait)
+            except queue.Empty:
+                # Idle gap - push out whatever has accumulated
+                self.flush()
+                continue
+
+            if item is _STOP:
+                self.flush()
+                return
+
+            self._pending.append(item)
+            if len(self._pending) >= self.batch_size or time.monotonic() - self._last_flush > self.max_wait:
+                self.flush()
+
+    def flush(self):
+        """Write all pending points to InfluxDB with retry logic."""
+        if not self._pending:
+            return True
+
         for attempt in range(1, self.max_retries + 1):
+            # Exponential backoff with jitter - bounds the worst-case
+            # stall without hammering the server in lockstep
+            backoff = self.retry_delay * (2 ** (attempt - 1)) + random.random()
+
             try:
-                # Create a data point based on sensor type
-                if data.get("temperature") and data.get("humidity") and data.get("pressure") and data.get("gas_resistance") and data.get("voc"):
-                    point = Point("bme688_sensor") \
-                        .tag("device", "feather_s2") \
-                        .field("temperature", data["temperature"]) \
-                        .field("humidity", data["humidity"]) \
-                        .field("pressure", data["pressure"]) \
-                        .field("gas_resistance", data["gas_resistance"]) \
-                        .field("voc", data["voc"]) \
-                        .time(datetime.utcnow())
-                elif data.get("co2") and data.get("temperature") and data.get("humidity"):
-                    point = Point("scd30_sensor") \
-                        .tag("device", "feather_s2") \
-                        .field("co2", data["co2"]) \
-                        .field("temperature", data["temperature"]) \
-                        .field("humidity", data["humidity"]) \
-                        .time(datetime.utcnow())
-                else:
-                    logger.error(f"Invalid data format: {data}")
-                    return False
-                
-                self.write_api.write(bucket=self.bucket, org=self.org, record=point)
-                logger.info(f"Data written to InfluxDB: {data}")
+                self.write_api.write(bucket=self.bucket, org=self.org, record=self._pending)
+                logger.info("Flushed %d point(s) to InfluxDB", len(self._pending))
+                self._pending.clear()
+                self._last_flush = time.monotonic()
                 return True
-                
+
             except ApiException as e:
+                if e.status is not None and 400 <= e.status < 500:
+                    # Client errors (malformed point, bad auth) will
+                    # never succeed on retry - drop the batch so it
+                    # can't poison every future flush
+                    logger.error(f"InfluxDB rejected write with HTTP {e.status}, dropping {len(self._pending)} point(s): {e}")
+                    self._pending.clear()
+                    self._last_flush = time.monotonic()
+                    return False
                 logger.error(f"InfluxDB API error during write (attempt {attempt}/{self.max_retries}): {e}")
                 if attempt < self.max_retries:
-                    logger.info(f"Retrying write in {self.retry_delay} seconds...")
-                    time.sleep(self.retry_delay)
+                    logger.info(f"Retrying write in {backoff:.1f} seconds...")
+                    time.sleep(backoff)
                 else:
                     logger.error("Maximum retry attempts reached. Could not write data.")
                     return False
-                    
-            except requests.exceptions.ConnectionError as e:
+
+            except urllib3.exceptions.HTTPError as e:
+                # The influxdb client rides on urllib3, so connection
+                # refusals and read timeouts surface as HTTPError
+                # subclasses, not requests exceptions
                 logger.error(f"Connection error during write (attempt {attempt}/{self.max_retries}): {e}")
                 if self.is_cloud:
                     logger.error("Could not connect to InfluxDB Cloud. Please check your internet connection.")
                 else:
                     logger.error("Could not connect to local InfluxDB. Please check if the server is running.")
-                    
+
                 if attempt < self.max_retries:
-                    logger.info(f"Retrying write in {self.retry_delay} seconds...")
-                    time.sleep(self.retry_delay)
+                    logger.info(f"Retrying write in {backoff:.1f} seconds...")
+                    time.sleep(backoff)
                 else:
                     logger.error("Maximum retry attempts reached. Could not write data.")
                     return False
-                    
+
             except Exception as e:
                 logger.error(f"Failed to write data (attempt {attempt}/{self.max_retries}): {e}")
                 if attempt < self.max_retries:
-                    logger.info(f"Retrying write in {self.retry_delay} seconds...")
-                    time.sleep(self.retry_delay)
+                    logger.info(f"Retrying write in {backoff:.1f} seconds...")
+                    time.sleep(backoff)
                 else:
                     logger.error("Maximum retry attempts reached. Could not write data.")
                     return False
-    
+
     def close(self):
-        """Close the InfluxDB client."""
+        """Stop the writer thread, flush, and close the InfluxDB client."""
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._q.put(_STOP)
+            self._writer_thread.join(timeout=30)
+            self._writer_thread = None
         if self.client:
             try:
+                self.flush()
+                self.write_api.close()
                 self.client.close()
                 logger.info("InfluxDB client closed")
             except Exception as e:
@@ -560,49 +520,48 @@ class InfluxDBWriter:
 def main():
     """Main function to read sensor data and write to InfluxDB Cloud."""
     # Load configuration from environment variables
-    load_configuration()
+    config = load_configuration()
     
     # Check if required environment variables are set
-    if not INFLUXDB_URL:
+    if not config.url:
         logger.error("InfluxDB URL is not set. Please set the INFLUXDB_URL environment variable.")
         sys.exit(1)
         
-    if not INFLUXDB_TOKEN:
+    if not config.token:
         logger.error("InfluxDB token is not set. Please set the INFLUXDB_TOKEN environment variable.")
         sys.exit(1)
     
-    if not INFLUXDB_ORG:
+    if not config.org:
         logger.error("InfluxDB organization is not set. Please set the INFLUXDB_ORG environment variable.")
         sys.exit(1)
         
-    if not INFLUXDB_BUCKET:
+    if not config.bucket:
         logger.error("InfluxDB bucket is not set. Please set the INFLUXDB_BUCKET environment variable.")
         sys.exit(1)
         
-    if not COM_PORT:
+    if not config.com_port:
         logger.error("COM port is not set. Please set the COM_PORT environment variable.")
         sys.exit(1)
     
     # Initialize sensor reader
-    sensor_reader = FeatherS2SensorReader(COM_PORT, sensor_type=SENSOR_TYPE)
+    sensor_reader = FeatherS2SensorReader(config.com_port, sensor_type=config.sensor_type)
     if not sensor_reader.connect():
         logger.error("Failed to connect to sensor. Exiting.")
         sys.exit(1)
     
     # Initialize InfluxDB writer with retry capabilities
-    is_cloud = 'cloud' in INFLUXDB_URL.lower() or not INFLUXDB_URL.startswith('http://localhost')
-    if is_cloud:
+    if config.is_cloud:
         logger.info("Connecting to InfluxDB Cloud...")
     else:
         logger.info("Connecting to local InfluxDB instance...")
         
-    influxdb_writer = InfluxDBWriter(INFLUXDB_URL, INFLUXDB_TOKEN, INFLUXDB_ORG, INFLUXDB_BUCKET, max_retries=3, retry_delay=5)
+    influxdb_writer = InfluxDBWriter(config, max_retries=3, retry_delay=5)
     if not influxdb_writer.connect():
         logger.error("Failed to connect to InfluxDB. Exiting.")
         sensor_reader.disconnect()
         sys.exit(1)
     
-    logger.info(f"Starting data collection. Measurement interval: {MEASUREMENT_INTERVAL} seconds")
+    logger.info(f"Starting data collection. Measurement interval: {config.interval} seconds")
     
     # Track consecutive failures
     consecutive_failures = 0
@@ -650,13 +609,13 @@ def main():
                     consecutive_failures = 0  # Reset counter after reconnection attempt
                 
                 # Wait for the next measurement
-                time.sleep(MEASUREMENT_INTERVAL)
+                time.sleep(config.interval)
                 
             except Exception as e:
                 logger.error(f"Error in main loop: {e}")
                 consecutive_failures += 1
                 logger.warning(f"Error in main loop. Consecutive failures: {consecutive_failures}/{max_consecutive_failures}")
-                time.sleep(MEASUREMENT_INTERVAL)  # Still wait before next attempt
+                time.sleep(config.interval)  # Still wait before next attempt
                 
     except KeyboardInterrupt:
         logger.info("Data collection stopped by user")
@@ -4,19 +4,33 @@ Test script to verify InfluxDB Cloud connection and write a test data point
 """
 import os
 import sys
-from datetime import datetime
+import time
+import atexit
+import socket
+import asyncio
+import logging
+import logging.handlers
+import urllib3
 from dotenv import load_dotenv
-from influxdb_client import InfluxDBClient, Point
-from influxdb_client.client.write_api import SYNCHRONOUS
+from urllib3.connection import HTTPConnection
+from influxdb_client import InfluxDBClient, WritePrecision
+from influxdb_client.client.write_api import WriteOptions
 
-# Set up file logging
-log_file = open('influxdb_cloud_test_log.txt', 'w')
+# One logger with two handlers replaces the old print + file.write
+# pair per message - a single emission path for both destinations.
+# Stdout stays immediate for crash visibility, but the file handler
+# sits behind a MemoryHandler so the run's messages hit the disk in
+# one buffered flush at shutdown instead of a write per log() call.
+logger = logging.getLogger("influx_test")
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.StreamHandler(sys.stdout))
+_file_handler = logging.FileHandler('influxdb_cloud_test_log.txt', mode='w')
+logger.addHandler(logging.handlers.MemoryHandler(
+    capacity=10_000, flushLevel=logging.CRITICAL, target=_file_handler))
 
 def log(message):
-    """Write message to both stdout and log file"""
-    print(message)
-    log_file.write(message + '\n')
-    log_file.flush()
+    """Log message to both stdout and the log file"""
+    logger.info(message)
 
 # Load environment variables - force reload
 load_dotenv(override=True)
@@ -32,115 +46,194 @@ log(f"InfluxDB Organization: {INFLUXDB_ORG}")
 log(f"InfluxDB Bucket: {INFLUXDB_BUCKET}")
 log(f"InfluxDB Token: {INFLUXDB_TOKEN[:10]}...{INFLUXDB_TOKEN[-5:] if len(INFLUXDB_TOKEN) > 15 else '***'}")
 
-# Create test data
-test_data = {
-    "temperature": 22.3,
-    "humidity": 45.7,
-    "pressure": 1013.2,
-    "gas_resistance": 12345,
-    "voc": 1.5
-}
-
-try:
-    # Initialize InfluxDB client
-    log("\nConnecting to InfluxDB Cloud...")
-    client = InfluxDBClient(url=INFLUXDB_URL, token=INFLUXDB_TOKEN, org=INFLUXDB_ORG)
-    write_api = client.write_api(write_options=SYNCHRONOUS)
-    query_api = client.query_api()
+# Long-lived client singleton - keeps the urllib3/TLS pool warm if
+# this module gets imported or the test is looped, per the client
+# library's create-once guidance
+_CLIENT = None
+
+def get_client():
+    """Return the shared InfluxDBClient, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        # gzip the write payload - line protocol compresses well and
+        # the cloud write path is network-bound
+        # connection_pool_maxsize=25 keeps concurrent writes and
+        # queries from fighting over the default pool if this script
+        # ever runs under a threaded harness
+        _CLIENT = InfluxDBClient(url=INFLUXDB_URL, token=INFLUXDB_TOKEN,
+                                 org=INFLUXDB_ORG, enable_gzip=True,
+                                 connection_pool_maxsize=25, timeout=30_000)
+        try:
+            pool_kw = _CLIENT.api_client.rest_client.pool_manager.connection_pool_kw
+            # Retry transient cloud hiccups (rate limiting, gateway
+            # flaps) at the transport layer instead of failing the run
+            pool_kw['retries'] = urllib3.Retry(
+                total=5, backoff_factor=0.2,
+                status_forcelist=[429, 503, 504])
+            # TCP keepalive stops idle NAT/firewall boxes from silently
+            # dropping the warm connection between write and query
+            socket_options = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+            if hasattr(socket, 'TCP_KEEPIDLE'):  # Linux only
+                socket_options.append(
+                    (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30))
+            pool_kw['socket_options'] = socket_options
+        except AttributeError:
+            pass  # client internals moved; defaults are fine
+        # Close at interpreter exit, not mid-script
+        atexit.register(_CLIENT.close)
+    return _CLIENT
+
+def main():
+    """Run the connect / write / query round-trip.
+
+    Everything hot lives in function locals now, so the query-results
+    loop runs on LOAD_FAST instead of module-dict lookups.
+    """
+    # Create test data
+    test_data = {
+        "temperature": 22.3,
+        "humidity": 45.7,
+        "pressure": 1013.2,
+        "gas_resistance": 12345,
+        "voc": 1.5
+    }
+
+    try:
+        # Initialize InfluxDB client
+        log("\nConnecting to InfluxDB Cloud...")
+        client = get_client()
+        query_api = client.query_api()
     
-    # 1. Check InfluxDB health
-    log("\nChecking InfluxDB Cloud health...")
-    health = client.health()
-    log(f"InfluxDB status: {health.status}")
-    log(f"InfluxDB version: {health.version}")
+        # 1+2. The health probe and the bucket lookup are independent, so
+        # overlap the two Cloud round-trips with asyncio.gather instead of
+        # paying them back to back. run_in_executor keeps the existing
+        # sync client (and its warm pool) rather than switching to
+        # InfluxDBClientAsync just for the pre-flight.
+        log("\nChecking InfluxDB Cloud health and bucket...")
+
+        async def _preflight():
+            loop = asyncio.get_running_loop()
+            return await asyncio.gather(
+                loop.run_in_executor(None, client.health),
+                loop.run_in_executor(
+                    None, client.buckets_api().find_bucket_by_name, INFLUXDB_BUCKET))
+
+        health, bucket = asyncio.run(_preflight())
+        log(f"InfluxDB status: {health.status}")
+        log(f"InfluxDB version: {health.version}")
     
-    # 2. Check bucket existence
-    log("\nChecking if bucket exists...")
-    buckets_api = client.buckets_api()
-    buckets = buckets_api.find_buckets().buckets
-    bucket_exists = False
+        if bucket is None:
+            log(f"Bucket '{INFLUXDB_BUCKET}' not found. Please create it in the InfluxDB Cloud UI.")
+            return 1
+        log(f"Bucket '{INFLUXDB_BUCKET}' exists")
     
-    for bucket in buckets:
-        if bucket.name == INFLUXDB_BUCKET:
-            bucket_exists = True
-            log(f"Bucket '{INFLUXDB_BUCKET}' exists")
-            break
+        # 3. Write test data using the InfluxDB client
+        log("\nWriting test data batch to InfluxDB Cloud...")
+        # The schema is fixed, so format the line protocol directly - no
+        # Point object, no builder chain, no to_line_protocol() pass. The
+        # 'i' suffix keeps gas_resistance an integer field, and the
+        # timestamp is integer seconds (utcnow() is deprecated anyway).
+        # 5000 points, one per second back from now, go out in a single
+        # request so the test exercises (and times) the real batched path
+        # rather than a lone point.
+        now = int(time.time())
+        lines = [(f"bme688_sensor,device=test_script "
+                  f"temperature={test_data['temperature']},"
+                  f"humidity={test_data['humidity']},"
+                  f"pressure={test_data['pressure']},"
+                  f"gas_resistance={test_data['gas_resistance']}i,"
+                  f"voc={test_data['voc']} {now - i}")
+                 for i in range(5000)]
+
+        # The batching api reports the batch's fate to callbacks, not
+        # as an exception from write() - collect the outcome so the
+        # test actually fails when the POST does.
+        write_outcome = {}
+        try:
+            # Batching write API - amortizes the HTTP round-trip if this
+            # script ever writes more than one point. The with-block
+            # flushes and closes the api before we query the data back,
+            # so the callbacks have fired by the time it exits.
+            with client.write_api(
+                    write_options=WriteOptions(
+                        batch_size=5000, flush_interval=1000, jitter_interval=200,
+                        retry_interval=5000, max_retries=3, max_retry_delay=30_000,
+                        exponential_base=2),
+                    success_callback=lambda conf, data: write_outcome.setdefault('ok', True),
+                    error_callback=lambda conf, data, err: write_outcome.setdefault('error', err)) as write_api:
+                write_api.write(bucket=INFLUXDB_BUCKET, org=INFLUXDB_ORG, record=lines,
+                                write_precision=WritePrecision.S)
+        except Exception as e:
+            write_outcome.setdefault('error', e)
+        if 'error' in write_outcome:
+            log(f"Write operation failed: {write_outcome['error']}")
+            log("This may indicate that your token lacks write permissions.")
+            return 1
+        log(f"{len(lines)} data points written successfully to InfluxDB Cloud!")
+
+        # 4. Query data to verify it was written
+        log("\nQuerying data to verify it was written...")
+        # limit before pivot so only 10 rows get pivoted, and keep just
+        # the columns we print so the annotated CSV ships 6 columns
+        # instead of ~15. The query text itself is constant - the bucket,
+        # measurement and device arrive via params, so a looped test
+        # reuses the same string and the server can cache the parsed plan.
+        query = '''
+        from(bucket: params.bucket)
+          |> range(start: -1h)
+          |> filter(fn: (r) => r._measurement == params.meas)
+          |> filter(fn: (r) => r.device == params.dev)
+          |> limit(n: 10)
+          |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+          |> keep(columns: ["_time", "temperature", "humidity", "pressure", "gas_resistance", "voc"])
+        '''
+        query_params = {"bucket": INFLUXDB_BUCKET, "meas": "bme688_sensor", "dev": "test_script"}
     
-    if not bucket_exists:
-        log(f"Bucket '{INFLUXDB_BUCKET}' not found. Please create it in the InfluxDB Cloud UI.")
-        sys.exit(1)
+        try:
+            # Stream records straight off the socket - no intermediate
+            # FluxTable list, so memory stays flat however big the range
+            found_any = False
+            for record in query_api.query_stream(org=INFLUXDB_ORG, query=query,
+                                                 params=query_params):
+                if not found_any:
+                    log("Query successful! Results:")
+                    found_any = True
+                record_time = record.get_time()
+                # Bind the values dict locally - one attribute lookup,
+                # then plain local dict gets for the five columns
+                v = record.values
+            
+                # Check if we're dealing with pivoted data
+                if "temperature" in v:
+                    # Pivoted data
+                    log(f"Time: {record_time} - Temperature: {v.get('temperature', 'N/A')}, Humidity: {v.get('humidity', 'N/A')}, Pressure: {v.get('pressure', 'N/A')}, Gas Resistance: {v.get('gas_resistance', 'N/A')}, VOC: {v.get('voc', 'N/A')}")
+                else:
+                    # Non-pivoted data
+                    field = record.get_field()
+                    value = record.get_value()
+                    log(f"Time: {record_time} - Field: {field}, Value: {value}")
+            if not found_any:
+                log("No data found in query result. This may be due to timing - try again in a few seconds.")
+        except Exception as e:
+            log(f"Query operation failed: {e}")
+            log("This may indicate that your token lacks read permissions.")
     
-    # 3. Write test data using the InfluxDB client
-    log("\nWriting test data point to InfluxDB Cloud...")
-    point = Point("bme688_sensor").tag("device", "test_script") \
-        .field("temperature", test_data["temperature"]) \
-        .field("humidity", test_data["humidity"]) \
-        .field("pressure", test_data["pressure"]) \
-        .field("gas_resistance", test_data["gas_resistance"]) \
-        .field("voc", test_data["voc"]) \
-        .time(datetime.utcnow())
+        log("\nTest completed! If you see data in the results above, your InfluxDB Cloud setup is working correctly.")
 
-    try:
-        write_api.write(bucket=INFLUXDB_BUCKET, org=INFLUXDB_ORG, record=point)
-        log("Data written successfully to InfluxDB Cloud!")
-    except Exception as e:
-        log(f"Write operation failed: {e}")
-        log("This may indicate that your token lacks write permissions.")
-        sys.exit(1)
-
-    # 4. Query data to verify it was written
-    log("\nQuerying data to verify it was written...")
-    query = f'''
-    from(bucket: "{INFLUXDB_BUCKET}")
-      |> range(start: -1h)
-      |> filter(fn: (r) => r._measurement == "bme688_sensor")
-      |> filter(fn: (r) => r.device == "test_script")
-      |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
-      |> limit(n: 10)
-    '''
-    
-    try:
-        result = query_api.query(org=INFLUXDB_ORG, query=query)
-        
-        if result:
-            log("Query successful! Results:")
-            for table in result:
-                for record in table.records:
-                    time = record.get_time()
-                    
-                    # Check if we're dealing with pivoted data
-                    if "temperature" in record.values:
-                        # Pivoted data
-                        temperature = record.values.get("temperature", "N/A")
-                        humidity = record.values.get("humidity", "N/A")
-                        pressure = record.values.get("pressure", "N/A")
-                        gas_resistance = record.values.get("gas_resistance", "N/A")
-                        voc = record.values.get("voc", "N/A")
-                        log(f"Time: {time} - Temperature: {temperature}, Humidity: {humidity}, Pressure: {pressure}, Gas Resistance: {gas_resistance}, VOC: {voc}")
-                    else:
-                        # Non-pivoted data
-                        field = record.get_field()
-                        value = record.get_value()
-                        log(f"Time: {time} - Field: {field}, Value: {value}")
-        else:
-            log("No data found in query result. This may be due to timing - try again in a few seconds.")
     except Exception as e:
-        log(f"Query operation failed: {e}")
-        log("This may indicate that your token lacks read permissions.")
-    
-    log("\nTest completed! If you see data in the results above, your InfluxDB Cloud setup is working correctly.")
-    client.close()
-
-except Exception as e:
-    log(f"\nError: {e}")
-    log("\nTroubleshooting tips:")
-    log("1. Make sure your InfluxDB Cloud URL is correct")
-    log("2. Check that your token is valid and has not expired")
-    log("3. Verify your organization name is correct")
-    log("4. Ensure your bucket exists in your InfluxDB Cloud instance")
-    log("5. Check your internet connection")
-    log_file.close()
-    sys.exit(1)
-finally:
-    # Make sure to close the log file
-    log_file.close()
+        log(f"\nError: {e}")
+        log("\nTroubleshooting tips:")
+        log("1. Make sure your InfluxDB Cloud URL is correct")
+        log("2. Check that your token is valid and has not expired")
+        log("3. Verify your organization name is correct")
+        log("4. Ensure your bucket exists in your InfluxDB Cloud instance")
+        log("5. Check your internet connection")
+        return 1
+    finally:
+        # Flush and close both handlers
+        logging.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(main() or 0)